@@ -5,7 +5,7 @@ Tests realistic puzzles and measures performance
 """
 
 import time
-from encoder import to_cnf
+from encoder import to_cnf, SINZ_MIN_GROUP
 from solver import solve_cnf
 
 def print_header(text):
@@ -90,18 +90,24 @@ def analyze_encoding():
         cells = N * N
         values = N
 
+        # Exactly-one over N literals: pairwise, or sequential counter
+        # (3N-4 clauses, N-1 auxiliary vars) for groups of SINZ_MIN_GROUP+
+        use_sinz = N >= SINZ_MIN_GROUP
+        amo_clauses = 3 * N - 4 if use_sinz else N * (N - 1) // 2
+        aux_vars = N - 1 if use_sinz else 0
+
         # Constraint counts
-        cell_clauses = cells * (1 + (values * (values - 1)) // 2)  # exactly-one per cell
-        row_clauses = N * values * (1 + (N * (N - 1)) // 2)  # exactly-one per row
-        col_clauses = N * values * (1 + (N * (N - 1)) // 2)  # exactly-one per col
-        box_clauses = N * values * (1 + (N * (N - 1)) // 2)  # exactly-one per box
+        cell_clauses = cells * (1 + amo_clauses)  # exactly-one per cell
+        row_clauses = N * values * (1 + amo_clauses)  # exactly-one per row
+        col_clauses = N * values * (1 + amo_clauses)  # exactly-one per col
+        box_clauses = N * values * (1 + amo_clauses)  # exactly-one per box
 
         # Non-consecutive (2 clauses per edge per value pair)
         edges = 2 * N * (N - 1)  # horizontal + vertical edges
         non_consec_clauses = edges * 2 * (values - 1)
 
         total_clauses = cell_clauses + row_clauses + col_clauses + box_clauses + non_consec_clauses
-        total_vars = N * N * N
+        total_vars = N * N * N + 4 * N * N * aux_vars
 
         print(f"\n{name} grid:")
         print(f"  Variables: {total_vars}")
@@ -1,252 +1,570 @@
 """
 SAT Assignment Part 2 - Non-consecutive Sudoku Solver (Puzzle -> SAT/UNSAT)
 
-Implementation of a DPLL-based SAT solver with optimizations:
+Implementation of a CDCL SAT solver with optimizations:
 - Two-watched literals for efficient unit propagation
-- VSIDS branching heuristic
+- Native at-most-one propagation for Sudoku's cardinality groups
+- 1-UIP conflict analysis with clause learning and non-chronological backjumping
+- VSIDS branching heuristic with phase saving
+- Luby-sequence restarts
 - Iterative approach to avoid recursion limits
 """
 
-from typing import Iterable, List, Tuple, Optional, Set
-from collections import defaultdict, deque
+import heapq
+from array import array
+from typing import Iterable, List, Tuple, Optional
+from collections import deque
 
+from encoder import clue_clauses, exactly_one_groups, non_consecutive_clauses
 
-class SATSolver:
+
+# Outcomes of update_watch for the slot being visited
+KEEP = 0  # slot stays in its watch list
+MOVED = 1  # slot now watches another literal; caller unlinks it
+UNIT = 2  # the other watched literal must become true
+CONFLICT = 3  # every literal of the clause is false
+
+# propagate() result when two literals of one at-most-one group are true
+AMO_CONFLICT = -2
+
+
+# Conflicts per unit of the Luby restart sequence
+RESTART_BASE = 100
+
+
+def luby(i: int) -> int:
+    """i-th element (1-based) of the Luby sequence 1, 1, 2, 1, 1, 2, 4, 1, ..."""
+    while True:
+        k = 1
+        while (1 << k) - 1 < i:
+            k += 1
+        if i == (1 << k) - 1:
+            return 1 << (k - 1)
+        i -= (1 << (k - 1)) - 1
+
+
+def lit_index(lit: int) -> int:
+    """Dense index of a literal: 2*var for positive, 2*var + 1 for negative."""
+    return 2 * lit if lit > 0 else 1 - 2 * lit
+
+
+def index_lit(idx: int) -> int:
+    """Inverse of lit_index."""
+    return -(idx >> 1) if idx & 1 else idx >> 1
+
+
+def update_watch(
+    slot: int,
+    false_literal: int,
+    lits: array,
+    offsets: array,
+    wl_head: array,
+    wl_next: array,
+    watch_lit: array,
+    assignment: array,
+    sat_lit: array,
+) -> int:
     """
-    DPLL-based SAT solver with two-watched literals and VSIDS heuristic.
+    Update a watch slot whose literal has just become false.
+
+    Watch slots 2*clause_idx and 2*clause_idx + 1 hold the two watched
+    literals of a clause; slot 2*clause_idx + 1 is 0 for unit clauses.
+    Returns KEEP, MOVED, UNIT or CONFLICT. On MOVED the slot has been
+    prepended to its new literal's list but is still linked into the
+    false literal's list, which the caller is traversing.
+    """
+    clause_idx = slot >> 1
+
+    # The other watched literal is true: satisfied, checked in O(1)
+    other = watch_lit[slot ^ 1]
+    if other and (assignment[other] if other > 0 else -assignment[-other]) == 1:
+        return KEEP
+
+    # sat_lit caches the last literal seen true in the clause; it is valid
+    # for as long as it stays true
+    cached = sat_lit[clause_idx]
+    if cached and (assignment[cached] if cached > 0 else -assignment[-cached]) == 1:
+        return KEEP
+
+    # Scan once for a literal that is not false: a true one satisfies the
+    # clause, an unassigned one becomes the new watch
+    for k in range(offsets[clause_idx], offsets[clause_idx + 1]):
+        lit = lits[k]
+        if lit == false_literal or lit == other:
+            continue
+
+        val = assignment[lit] if lit > 0 else -assignment[-lit]
+        if val == 1:
+            sat_lit[clause_idx] = lit
+            return KEEP
+        if val == 0:
+            # Prepend the slot to the new literal's list
+            new_idx = lit_index(lit)
+            wl_next[slot] = wl_head[new_idx]
+            wl_head[new_idx] = slot
+            watch_lit[slot] = lit
+            return MOVED
+
+    # Couldn't find a new literal to watch: unit clause or conflict
+    if other == 0:
+        # Single watched literal is false - CONFLICT
+        return CONFLICT
+
+    if assignment[other if other > 0 else -other] == 0:
+        # Unit propagation - this literal must be true
+        return UNIT
+
+    # All literals are false - CONFLICT
+    return CONFLICT
+
+
+def propagate(
+    lits: array,
+    offsets: array,
+    wl_head: array,
+    wl_next: array,
+    watch_lit: array,
+    assignment: array,
+    sat_lit: array,
+    queue: deque,
+    trail: List[int],
+    reason: array,
+    var_level: array,
+    level: int,
+    lit_amo: List[List[int]],
+    amo_lits: array,
+    amo_offsets: array,
+    conflict_pair: array,
+) -> int:
     """
+    Boolean Constraint Propagation over the flat clause arrays.
 
-    def __init__(self, clauses: Iterable[Iterable[int]], num_vars: int):
-        self.num_vars = num_vars
+    queue holds literals that are already assigned but whose watchers have
+    not been visited yet. Implied literals are assigned immediately,
+    recording their reason clause and level, appended to trail and queued.
 
-        # Convert clauses to lists and store
-        self.clauses = [list(c) for c in clauses]
-        self.num_clauses = len(self.clauses)
+    lit_amo[lit_index(lit)] lists the at-most-one groups containing lit;
+    group g's members are amo_lits[amo_offsets[g]:amo_offsets[g + 1]].
+    Literals falsified by such a group get reason -1 - lit_index(true
+    literal), i.e. the implicit binary clause.
 
-        # Assignment: None = unassigned, True = positive, False = negative
-        self.assignment = [None] * (num_vars + 1)
+    Returns the index of a conflicting clause, -1 if there is none, or
+    AMO_CONFLICT with the two true group literals stored in conflict_pair.
+    """
+    while queue:
+        lit = queue.popleft()
+
+        # At-most-one groups: every other member of a group becomes false,
+        # without going through watched clauses
+        for group in lit_amo[lit_index(lit)]:
+            for other in amo_lits[amo_offsets[group] : amo_offsets[group + 1]]:
+                if other == lit:
+                    continue
+                var = other if other > 0 else -other
+                val = assignment[var] if other > 0 else -assignment[var]
+                if val == 0:
+                    assignment[var] = -1 if other > 0 else 1
+                    reason[var] = -1 - lit_index(lit)
+                    var_level[var] = level
+                    trail.append(-other)
+                    queue.append(-other)
+                elif val == 1:
+                    conflict_pair[0] = lit
+                    conflict_pair[1] = other
+                    return AMO_CONFLICT
+
+        # Walk the watch list of the negation of this literal in place,
+        # unlinking moved slots through prev: no copy, O(1) per watcher.
+        # The next slot is read first because a move relinks wl_next[w]
+        neg_lit = -lit
+        neg_idx = lit_index(neg_lit)
+        prev = -1
+        w = wl_head[neg_idx]
+        while w != -1:
+            nxt = wl_next[w]
+            result = update_watch(
+                w,
+                neg_lit,
+                lits,
+                offsets,
+                wl_head,
+                wl_next,
+                watch_lit,
+                assignment,
+                sat_lit,
+            )
+            if result == MOVED:
+                if prev == -1:
+                    wl_head[neg_idx] = nxt
+                else:
+                    wl_next[prev] = nxt
+            elif result == CONFLICT:
+                return w >> 1  # Conflict detected; the list is intact
+            else:
+                if result == UNIT:
+                    implied = watch_lit[w ^ 1]
+                    var = implied if implied > 0 else -implied
+                    assignment[var] = 1 if implied > 0 else -1
+                    reason[var] = w >> 1
+                    var_level[var] = level
+                    trail.append(implied)
+                    queue.append(implied)
+                prev = w
+            w = nxt
 
-        # Watch lists: literal -> list of clause indices watching this literal
-        # For each clause, we watch exactly 2 literals (or 1 for unit clauses)
-        self.watch_list = defaultdict(list)
+    return -1
 
-        # For each clause, track which two literals are being watched
-        self.watched = {}  # clause_id -> [lit1, lit2] or [lit1]
 
-        # Decision stack for backtracking: [(var, value, decision_level)]
-        self.decision_stack = []
+class SATSolver:
+    """
+    CDCL SAT solver with two-watched literals and VSIDS heuristic.
+    """
+
+    def __init__(
+        self,
+        clauses: Iterable[Iterable[int]],
+        num_vars: int,
+        amo_groups: Iterable[Iterable[int]] = (),
+    ):
+        self.num_vars = num_vars
+
+        # Flat clause storage: clause i is lits[offsets[i]:offsets[i + 1]]
+        self.lits = array("i")
+        self.offsets = array("i", [0])
+        for clause in clauses:
+            self.lits.extend(clause)
+            self.offsets.append(len(self.lits))
+        self.num_clauses = len(self.offsets) - 1
+
+        # Set when the input contains an empty clause or contradicting units
+        self.root_conflict = False
+
+        # Assignment: 0 = unassigned, 1 = positive, -1 = negative (int8)
+        self.assignment = array("b", bytes(num_vars + 1))
+
+        # Watch lists as intrusive linked lists over watch slots: clause i
+        # owns slots 2*i and 2*i + 1 (one per watched literal).
+        # wl_head[lit_index(literal)] is the first slot watching literal,
+        # wl_next[slot] the following one; -1 terminates a list
+        self.wl_head = array("i", [-1]) * (2 * (num_vars + 1))
+        self.wl_next = array("i", [-1]) * (2 * self.num_clauses)
+
+        # Literal watched by each slot (0 for the unused slot of a unit clause)
+        self.watch_lit = array("i", [0]) * (2 * self.num_clauses)
+
+        # Trail of assigned literals in assignment order; trail_lim[d] is the
+        # trail length when decision level d + 1 started
+        self.trail = []
+        self.trail_lim = []
         self.decision_level = 0
 
-        # Propagation queue for unit propagation
+        # Implication graph: reason clause (-1 for decisions) and decision
+        # level of every assigned variable
+        self.reason = array("i", [-1]) * (num_vars + 1)
+        self.var_level = array("i", [0]) * (num_vars + 1)
+
+        # At-most-one groups propagated natively (their at-least-one half,
+        # if any, must be passed as an ordinary clause).
+        # Members are stored flat like the clauses;
+        # lit_amo[lit_index(lit)] -> ids of the groups containing lit
+        self.amo_lits = array("i")
+        self.amo_offsets = array("i", [0])
+        self.lit_amo = [[] for _ in range(2 * (num_vars + 1))]
+        for group_id, members in enumerate(amo_groups):
+            for lit in members:
+                self.amo_lits.append(lit)
+                self.lit_amo[lit_index(lit)].append(group_id)
+            self.amo_offsets.append(len(self.amo_lits))
+        self.conflict_pair = array("i", [0, 0])
+
+        # Scratch marks used by conflict analysis
+        self.seen = bytearray(num_vars + 1)
+
+        # Propagation queue: assigned literals whose watchers are pending
         self.propagation_queue = deque()
 
-        # VSIDS heuristic: activity scores for variables
-        self.activity = [0.0] * (num_vars + 1)
+        # VSIDS heuristic: activity scores for variables, seeded with
+        # Jeroslow-Wang weights so the first decisions follow occurrence counts
+        self.activity = self._jeroslow_wang()
         self.activity_increment = 1.0
         self.activity_decay = 0.95
 
-        # Track which clauses are satisfied (for efficiency)
-        self.satisfied_clauses = set()
+        # Phase saving: last polarity of each variable, used for decisions
+        self.saved_phase = [False] * (num_vars + 1)
+
+        # Restarts after luby(luby_idx) * RESTART_BASE conflicts
+        self.conflicts = 0
+        self.luby_idx = 1
+        self.restart_limit = RESTART_BASE
+
+        # Max-heap of (-activity, var) branching candidates. Entries are lazy:
+        # assigned or outdated ones are skipped when popped
+        self.var_heap = []
+        self._rebuild_heap()
+
+        # Per clause, a literal last seen true in it (0 if none). A clause is
+        # known satisfied while that literal is still true, so the cache
+        # never has to be cleared on backtrack
+        self.sat_lit = array("i", [0]) * self.num_clauses
 
         # Initialize watches for all clauses
         self._initialize_watches()
 
     def _initialize_watches(self):
-        """Set up initial watch literals for all clauses."""
-        for clause_idx, clause in enumerate(self.clauses):
-            if len(clause) == 0:
+        """
+        Set up initial watch literals for all clauses.
+
+        Unit clauses are assigned first, so the watches of longer clauses can
+        avoid literals those units already falsify.
+        """
+        lits = self.lits
+        offsets = self.offsets
+        assignment = self.assignment
+
+        # Pass 1: unit and empty clauses
+        for clause_idx in range(self.num_clauses):
+            start = offsets[clause_idx]
+            size = offsets[clause_idx + 1] - start
+            if size == 0:
                 # Empty clause - immediately UNSAT
-                continue
-            elif len(clause) == 1:
+                self.root_conflict = True
+            elif size == 1:
                 # Unit clause - watch the single literal
-                lit = clause[0]
-                self.watch_list[lit].append(clause_idx)
-                self.watched[clause_idx] = [lit]
-                # Add to propagation queue
-                self.propagation_queue.append(lit)
-            else:
-                # Watch first two literals
-                lit1, lit2 = clause[0], clause[1]
-                self.watch_list[lit1].append(clause_idx)
-                self.watch_list[lit2].append(clause_idx)
-                self.watched[clause_idx] = [lit1, lit2]
-
-    def _is_clause_satisfied(self, clause_idx: int) -> bool:
-        """Check if a clause is satisfied by current assignment."""
-        if clause_idx in self.satisfied_clauses:
-            return True
-
-        clause = self.clauses[clause_idx]
-        for lit in clause:
-            var = abs(lit)
-            val = self.assignment[var]
-            if val is not None and (val == (lit > 0)):
-                self.satisfied_clauses.add(clause_idx)
-                return True
-        return False
-
-    def _literal_value(self, lit: int) -> Optional[bool]:
-        """Get the truth value of a literal under current assignment."""
-        var = abs(lit)
-        val = self.assignment[var]
-        if val is None:
-            return None
-        return val if lit > 0 else not val
+                lit = lits[start]
+                self._add_watch(2 * clause_idx, lit)
+                # Assign at level 0 and add to propagation queue
+                if not self._enqueue(lit, clause_idx):
+                    self.root_conflict = True
+
+        # Pass 2: watch two non-false literals of every longer clause
+        for clause_idx in range(self.num_clauses):
+            start, end = offsets[clause_idx], offsets[clause_idx + 1]
+            if end - start < 2:
+                continue
+
+            watch = []  # positions of the chosen literals
+            satisfied = False
+            for k in range(start, end):
+                lit = lits[k]
+                val = assignment[lit] if lit > 0 else -assignment[-lit]
+                if val == 1:
+                    satisfied = True
+                    break
+                if val == 0 and len(watch) < 2 and (not watch or lits[watch[0]] != lit):
+                    watch.append(k)
+            if satisfied:
+                # True at level 0, which is never undone: the clause can
+                # neither propagate nor conflict, so it needs no watches
+                continue
 
-    def _assign(self, lit: int) -> bool:
+            # Fewer than two non-false literals: fill up with false ones,
+            # whose negations are still queued and will revisit the clause
+            for k in range(start, end):
+                if len(watch) == 2:
+                    break
+                if k not in watch:
+                    watch.append(k)
+
+            self._add_watch(2 * clause_idx, lits[watch[0]])
+            self._add_watch(2 * clause_idx + 1, lits[watch[1]])
+
+    def _add_watch(self, slot: int, lit: int):
+        """Make slot watch lit by prepending it to lit's watch list."""
+        idx = lit_index(lit)
+        self.wl_next[slot] = self.wl_head[idx]
+        self.wl_head[idx] = slot
+        self.watch_lit[slot] = lit
+
+    def _enqueue(self, lit: int, reason: int) -> bool:
         """
-        Assign a literal to true.
+        Assign a literal to true with the given reason clause (-1 for a
+        decision) and queue it for propagation.
         Returns False if this creates a conflict, True otherwise.
         """
         var = abs(lit)
-        value = lit > 0
+        value = 1 if lit > 0 else -1
 
         # Check for conflict
-        if self.assignment[var] is not None:
-            if self.assignment[var] != value:
-                return False  # Conflict!
-            return True  # Already assigned consistently
+        if self.assignment[var] != 0:
+            return self.assignment[var] == value
 
         # Make assignment
         self.assignment[var] = value
-        self.decision_stack.append((var, value, self.decision_level))
-
+        self.reason[var] = reason
+        self.var_level[var] = self.decision_level
+        self.trail.append(lit)
+        self.propagation_queue.append(lit)
         return True
 
-    def _update_watch(self, clause_idx: int, false_literal: int) -> bool:
+    def _propagate(self) -> int:
         """
-        Update watch for a clause when one of its watched literals becomes false.
-        Returns False if conflict detected, True otherwise.
+        Perform Boolean Constraint Propagation (unit propagation).
+        Returns the conflicting clause index, -1 if no conflict, or
+        AMO_CONFLICT (the two true literals are left in conflict_pair).
         """
-        clause = self.clauses[clause_idx]
-        watched = self.watched[clause_idx]
-
-        # If clause already satisfied, nothing to do
-        if self._is_clause_satisfied(clause_idx):
-            return True
-
-        # Find a new literal to watch (unassigned or true)
-        for lit in clause:
-            if lit == false_literal:
-                continue
-
-            # Check if this literal is already watched
-            if lit in watched:
-                continue
-
-            lit_val = self._literal_value(lit)
-
-            # Watch literals that are unassigned or true
-            if lit_val is None or lit_val is True:
-                # Replace the false watch with this new literal
-                self.watch_list[false_literal].remove(clause_idx)
-                self.watch_list[lit].append(clause_idx)
-
-                # Update watched list
-                watched_idx = watched.index(false_literal)
-                watched[watched_idx] = lit
-
-                return True
-
-        # Couldn't find a new literal to watch
-        # Check if this is a unit clause or conflict
-
-        # Find the other watched literal(s)
-        other_lits = [lit for lit in watched if lit != false_literal]
-
-        if not other_lits:
-            # All literals are false - CONFLICT
-            return False
-
-        # Check if other watched literal is unassigned
-        for lit in other_lits:
-            lit_val = self._literal_value(lit)
-            if lit_val is None:
-                # Unit propagation - this literal must be true
-                self.propagation_queue.append(lit)
-                return True
-            elif lit_val is True:
-                # Other literal is true - clause satisfied
-                self.satisfied_clauses.add(clause_idx)
-                return True
-
-        # All other literals are false - CONFLICT
-        return False
-
-    def _propagate(self) -> bool:
+        return propagate(
+            self.lits,
+            self.offsets,
+            self.wl_head,
+            self.wl_next,
+            self.watch_lit,
+            self.assignment,
+            self.sat_lit,
+            self.propagation_queue,
+            self.trail,
+            self.reason,
+            self.var_level,
+            self.decision_level,
+            self.lit_amo,
+            self.amo_lits,
+            self.amo_offsets,
+            self.conflict_pair,
+        )
+
+    def _analyze(self, conflict_idx: int) -> Tuple[List[int], int]:
         """
-        Perform Boolean Constraint Propagation (unit propagation).
-        Returns False if conflict detected, True otherwise.
+        1-UIP conflict analysis.
+
+        Resolves the conflicting clause against the reasons of current-level
+        literals, latest first, until a single current-level literal (the
+        first UIP) remains. An AMO_CONFLICT is analyzed as the violated
+        binary clause (-x, -y) over the literals in conflict_pair, which is
+        never stored. Returns the learned clause, with the asserting
+        literal first and a literal of the backjump level second, together
+        with that backjump level.
         """
-        while self.propagation_queue:
-            lit = self.propagation_queue.popleft()
-
-            # Assign this literal
-            if not self._assign(lit):
-                return False  # Conflict during assignment
-
-            # Check all clauses watching the negation of this literal
-            neg_lit = -lit
+        lits = self.lits
+        offsets = self.offsets
+        seen = self.seen
+        var_level = self.var_level
+        trail = self.trail
+        level = self.decision_level
+
+        learnt = [0]  # slot for the asserting literal
+        pending = 0  # current-level literals not yet resolved away
+        resolved = 0
+        idx = len(trail) - 1
+        clause_idx = conflict_idx
 
-            # Make a copy of the watch list since it may be modified
-            watching_clauses = self.watch_list[neg_lit][:]
-
-            for clause_idx in watching_clauses:
-                if not self._update_watch(clause_idx, neg_lit):
-                    return False  # Conflict detected
-
-        return True
+        while True:
+            if clause_idx >= 0:
+                clause = lits[offsets[clause_idx] : offsets[clause_idx + 1]]
+            elif clause_idx == AMO_CONFLICT:
+                clause = (-self.conflict_pair[0], -self.conflict_pair[1])
+            else:
+                # Implied by an at-most-one group: clause (-x, resolved)
+                clause = (-index_lit(-1 - clause_idx),)
+            for lit in clause:
+                if lit == resolved:
+                    continue
+                var = abs(lit)
+                if not seen[var] and var_level[var] > 0:
+                    seen[var] = 1
+                    if var_level[var] == level:
+                        pending += 1
+                    else:
+                        learnt.append(lit)
+
+            # Next literal to resolve on: latest marked one on the trail
+            while not seen[abs(trail[idx])]:
+                idx -= 1
+            resolved = trail[idx]
+            idx -= 1
+            var = abs(resolved)
+            seen[var] = 0
+            pending -= 1
+            if pending == 0:
+                break
+            clause_idx = self.reason[var]
+
+        learnt[0] = -resolved
+        for lit in learnt[1:]:
+            seen[abs(lit)] = 0
+
+        # Backjump to the highest level among the other literals, which is
+        # moved to position 1 so it becomes the second watch
+        backjump_level = 0
+        if len(learnt) > 1:
+            best = 1
+            for i in range(2, len(learnt)):
+                if var_level[abs(learnt[i])] > var_level[abs(learnt[best])]:
+                    best = i
+            learnt[1], learnt[best] = learnt[best], learnt[1]
+            backjump_level = var_level[abs(learnt[1])]
+
+        return learnt, backjump_level
+
+    def _store_clause(self, clause: List[int]) -> int:
+        """Append a clause (with free watch slots) and return its index."""
+        clause_idx = self.num_clauses
+        self.lits.extend(clause)
+        self.offsets.append(len(self.lits))
+        self.num_clauses += 1
+        self.wl_next.extend((-1, -1))
+        self.watch_lit.extend((0, 0))
+        self.sat_lit.append(0)
+        return clause_idx
+
+    def _add_learnt_clause(self, learnt: List[int]):
+        """Store a learned clause, watch it and assert its first literal."""
+        clause_idx = self._store_clause(learnt)
+
+        self._add_watch(2 * clause_idx, learnt[0])
+        if len(learnt) > 1:
+            self._add_watch(2 * clause_idx + 1, learnt[1])
+
+        for lit in learnt:
+            self._bump_activity(abs(lit))
+
+        self._enqueue(learnt[0], clause_idx)
 
     def _all_vars_assigned(self) -> bool:
         """Check if all variables are assigned."""
-        for i in range(1, self.num_vars + 1):
-            if self.assignment[i] is None:
-                return False
-        return True
+        # The trail holds exactly one literal per assigned variable, so its
+        # length is the assignment counter
+        return len(self.trail) == self.num_vars
+
+    def _jeroslow_wang(self) -> List[float]:
+        """Initial activities: sum of 2^-|C| over the clauses C containing var."""
+        activity = [0.0] * (self.num_vars + 1)
+        lits = self.lits
+        offsets = self.offsets
+        for clause_idx in range(self.num_clauses):
+            start, end = offsets[clause_idx], offsets[clause_idx + 1]
+            weight = 2.0 ** (start - end)
+            for k in range(start, end):
+                activity[abs(lits[k])] += weight
+        return activity
+
+    def _rebuild_heap(self):
+        """Recreate the branching heap from the unassigned variables."""
+        self.var_heap = [
+            (-self.activity[var], var)
+            for var in range(1, self.num_vars + 1)
+            if self.assignment[var] == 0
+        ]
+        heapq.heapify(self.var_heap)
 
     def _select_variable_vsids(self) -> Optional[int]:
         """Select an unassigned variable using VSIDS heuristic."""
-        best_var = None
-        best_activity = -1.0
-
-        for var in range(1, self.num_vars + 1):
-            if self.assignment[var] is None:
-                if self.activity[var] > best_activity:
-                    best_activity = self.activity[var]
-                    best_var = var
-
-        return best_var
-
-    def _select_variable_dlis(self) -> Optional[int]:
-        """Select variable using DLIS (Dynamic Largest Individual Sum) heuristic."""
-        literal_count = defaultdict(int)
-
-        for clause_idx, clause in enumerate(self.clauses):
-            # Skip satisfied clauses
-            if self._is_clause_satisfied(clause_idx):
-                continue
-
-            for lit in clause:
-                var = abs(lit)
-                if self.assignment[var] is None:
-                    literal_count[lit] += 1
-
-        if not literal_count:
-            return None
-
-        # Return the variable (not literal) with highest count
-        best_lit = max(literal_count.items(), key=lambda x: x[1])[0]
-        return abs(best_lit)
+        heap = self.var_heap
+        while heap:
+            neg_activity, var = heapq.heappop(heap)
+            if self.assignment[var] == 0 and -neg_activity == self.activity[var]:
+                return var
+        return None
 
     def _bump_activity(self, var: int):
         """Increase activity score for a variable (VSIDS)."""
         self.activity[var] += self.activity_increment
+        heapq.heappush(self.var_heap, (-self.activity[var], var))
 
         # Rescale if necessary to prevent overflow
         if self.activity[var] > 1e100:
             for i in range(len(self.activity)):
                 self.activity[i] *= 1e-100
             self.activity_increment *= 1e-100
+            self._rebuild_heap()
 
     def _decay_activities(self):
         """Decay activity increment (VSIDS)."""
@@ -254,22 +572,30 @@ class SATSolver:
 
     def _backtrack(self, target_level: int):
         """Backtrack to a specific decision level."""
-        while self.decision_stack and self.decision_stack[-1][2] > target_level:
-            var, _, _ = self.decision_stack.pop()
-            self.assignment[var] = None
+        if self.decision_level > target_level:
+            start = self.trail_lim[target_level]
+            for lit in self.trail[start:]:
+                var = abs(lit)
+                self.saved_phase[var] = lit > 0
+                self.assignment[var] = 0
+                heapq.heappush(self.var_heap, (-self.activity[var], var))
+            del self.trail[start:]
+            del self.trail_lim[target_level:]
 
         self.decision_level = target_level
+        self.propagation_queue.clear()
 
-        # Clear satisfied clauses cache
-        self.satisfied_clauses.clear()
+        # Drop stale entries once they outnumber the live ones
+        if len(self.var_heap) > 4 * self.num_vars:
+            self._rebuild_heap()
 
     def _extract_model(self) -> List[int]:
         """Extract a DIMACS-format model from current assignment."""
         model = []
         for var in range(1, self.num_vars + 1):
-            if self.assignment[var] is True:
+            if self.assignment[var] == 1:
                 model.append(var)
-            elif self.assignment[var] is False:
+            elif self.assignment[var] == -1:
                 model.append(-var)
             else:
                 # Unassigned - can assign arbitrarily, choose positive
@@ -278,64 +604,106 @@ class SATSolver:
 
     def solve(self) -> Tuple[str, Optional[List[int]]]:
         """
-        Main DPLL solver using iterative approach.
+        Main CDCL loop: propagate, learn from conflicts, decide.
         Returns ("SAT", model) or ("UNSAT", None).
         """
-        # Initial unit propagation
-        if not self._propagate():
+        if self.root_conflict:
             return ("UNSAT", None)
 
-        # Check if already satisfied
-        if self._all_vars_assigned():
-            return ("SAT", self._extract_model())
-
-        # Iterative DPLL with explicit stack
-        # Stack contains: (decision_literal, tried_negative)
-        search_stack = []
-
         while True:
-            # Try to propagate
-            if not self._propagate():
-                # Conflict - backtrack
-                if not search_stack:
-                    return ("UNSAT", None)
-
-                # Backtrack to last decision
-                while search_stack:
-                    decision_lit, tried_negative = search_stack.pop()
-                    decision_var = abs(decision_lit)
-                    decision_level = len(search_stack)
-
-                    # Backtrack to this level
-                    self._backtrack(decision_level)
-                    self.propagation_queue.clear()
-
-                    if not tried_negative:
-                        # Try the opposite value
-                        search_stack.append((decision_lit, True))
-                        self.decision_level = len(search_stack)
-                        self.propagation_queue.append(-decision_lit)
-                        break
-
-                if not search_stack:
+            conflict_idx = self._propagate()
+            if conflict_idx != -1:
+                # Conflict without any decision - formula is UNSAT
+                if self.decision_level == 0:
                     return ("UNSAT", None)
 
+                learnt, backjump_level = self._analyze(conflict_idx)
+                self._backtrack(backjump_level)
+                self._add_learnt_clause(learnt)
+                self._decay_activities()
+                self.conflicts += 1
                 continue
 
             # Check if all variables assigned (SAT)
             if self._all_vars_assigned():
                 return ("SAT", self._extract_model())
 
+            # Restart between decisions, once the queue has been fully
+            # propagated; learned clauses and activities are kept
+            if self.conflicts >= self.restart_limit:
+                self._backtrack(0)
+                self.luby_idx += 1
+                self.restart_limit = self.conflicts + luby(self.luby_idx) * RESTART_BASE
+
             # Make a decision
-            var = self._select_variable_dlis()
+            var = self._select_variable_vsids()
             if var is None:
                 # No unassigned variables but not all assigned? Should not happen
                 return ("SAT", self._extract_model())
 
-            # Choose positive polarity first
-            self.decision_level = len(search_stack) + 1
-            search_stack.append((var, False))
-            self.propagation_queue.append(var)
+            # Reuse the saved polarity, at a new decision level
+            self.trail_lim.append(len(self.trail))
+            self.decision_level += 1
+            self._enqueue(var if self.saved_phase[var] else -var, -1)
+
+
+def simplify(
+    clauses: Iterable[Iterable[int]], num_vars: int
+) -> Tuple[Optional[List[List[int]]], List[Optional[bool]]]:
+    """
+    Level-0 preprocessing: unit propagation and pure-literal elimination,
+    repeated until a fixpoint.
+
+    Satisfied clauses are dropped and falsified literals removed. Returns
+    (remaining_clauses, fixed) where fixed[var] is the forced value or
+    None; remaining_clauses is None if an empty clause was derived.
+    """
+    fixed = [None] * (num_vars + 1)
+
+    changed = True
+    while changed:
+        changed = False
+        pos_count = [0] * (num_vars + 1)
+        neg_count = [0] * (num_vars + 1)
+        remaining = []
+
+        for clause in clauses:
+            reduced = []
+            satisfied = False
+            for lit in clause:
+                val = fixed[abs(lit)]
+                if val is None:
+                    reduced.append(lit)
+                elif val == (lit > 0):
+                    satisfied = True
+                    break
+            if satisfied:
+                continue
+            if not reduced:
+                return None, fixed
+            if len(reduced) == 1:
+                # Unit clause: force it (later clauses already see the value)
+                lit = reduced[0]
+                fixed[abs(lit)] = lit > 0
+                changed = True
+                continue
+
+            for lit in reduced:
+                if lit > 0:
+                    pos_count[lit] += 1
+                else:
+                    neg_count[-lit] += 1
+            remaining.append(reduced)
+
+        # Pure literals: a variable occurring with one sign only
+        for var in range(1, num_vars + 1):
+            if fixed[var] is None and (pos_count[var] > 0) != (neg_count[var] > 0):
+                fixed[var] = pos_count[var] > 0
+                changed = True
+
+        clauses = remaining
+
+    return clauses, fixed
 
 
 def solve_cnf(clauses: Iterable[Iterable[int]], num_vars: int) -> Tuple[str, List[int] | None]:
@@ -350,20 +718,40 @@ def solve_cnf(clauses: Iterable[Iterable[int]], num_vars: int) -> Tuple[str, Lis
         ("SAT", model) where model is a list of ints (DIMACS-style), or
         ("UNSAT", None)
     """
-    # Handle edge cases
-    clauses_list = list(clauses)
-
-    # Check for empty formula
-    if not clauses_list:
-        # Empty formula is satisfiable
-        model = list(range(1, num_vars + 1))
+    # Settle units and pure literals before building the watch structures
+    clauses, fixed = simplify(clauses, num_vars)
+    if clauses is None:
+        return ("UNSAT", None)
+
+    # Check for empty formula (possibly after simplification)
+    if not clauses:
+        model = [-var if fixed[var] is False else var for var in range(1, num_vars + 1)]
         return ("SAT", model)
 
-    # Check for empty clause
-    for clause in clauses_list:
-        if len(list(clause)) == 0:
-            return ("UNSAT", None)
+    # Create solver (flattens the clauses once) and solve
+    solver = SATSolver(clauses, num_vars)
+    status, model = solver.solve()
+    if model is not None:
+        # Variables fixed by simplify no longer occur in the clauses
+        for var in range(1, num_vars + 1):
+            if fixed[var] is not None:
+                model[var - 1] = var if fixed[var] else -var
+    return (status, model)
+
+
+def solve_sudoku(grid: List[List[int]]) -> Tuple[str, Optional[List[int]]]:
+    """
+    Solve a non-consecutive Sudoku using native at-most-one propagation.
+
+    The cell/row/column/box groups are handled by the solver's at-most-one
+    propagator, so only their at-least-one clauses, the non-consecutive
+    binary clauses and the clues are stored as CNF.
+
+    Returns ("SAT", model) over the N^3 cell variables, or ("UNSAT", None).
+    """
+    N = len(grid)
+    groups = exactly_one_groups(N)
+    clauses = groups + non_consecutive_clauses(N) + clue_clauses(grid)
 
-    # Create solver and solve
-    solver = SATSolver(clauses_list, num_vars)
+    solver = SATSolver(clauses, N * N * N, amo_groups=groups)
     return solver.solve()
@@ -1,3 +1,37 @@
+import heapq
+import multiprocessing
+from multiprocessing.connection import wait
+import os
+import random
+
+# Values stored in the search's value bytearray (and simplify's fixed array)
+UNASSIGNED = 0
+TRUE = 1
+FALSE = 2
+
+# VSIDS activity decay factors, applied once per conflict
+VAR_DECAY = 0.95
+CLAUSE_DECAY = 0.999
+
+# Learned clauses allowed before the database is first reduced: a third of
+# the input clauses, at least LEARNTS_MIN, growing 10% after each reduction
+LEARNTS_MIN = 2000
+
+# Restart after RESTART_BASE * luby(i) conflicts, i counting the restarts.
+# Same base as solPab.py: on the Sudoku benchmarks 512 did no better
+RESTART_BASE = 100
+
+# Smallest clause count (after simplify) worth running a multi-process
+# portfolio for. A 9x9 puzzle keeps about 14k clauses and usually solves
+# serially in tens of milliseconds, which forking the workers alone would
+# double or triple; 16x16 puzzles keep about 135k and search for seconds
+PORTFOLIO_MIN_CLAUSES = 20000
+
+# Most portfolio workers: each one forks a copy of the solver state, and
+# beyond a few seeds the extra diversity rarely pays for it
+PORTFOLIO_MAX_WORKERS = 4
+
+
 def solve_cnf(clauses, num_vars):
     """
         clauses: list of clauses, each clause is a list of ints
@@ -7,213 +41,534 @@ def solve_cnf(clauses, num_vars):
         ("SAT", model) where model is a list of ints,
         or ("UNSAT", None)
     """
-    clauses = [list(c) for c in clauses]  # ensure normal lists
+    simplified = simplify(clauses, num_vars)
+    if simplified is None:
+        return ("UNSAT", None)
+    clauses, fixed = simplified
+    clauses = encode_clauses(clauses)
 
-    assignment = dpll_iterative(clauses, num_vars)
+    workers = min(available_cpus(), PORTFOLIO_MAX_WORKERS)
+    if workers > 1 and len(clauses) >= PORTFOLIO_MIN_CLAUSES:
+        value = portfolio_search(clauses, num_vars, workers)
+    else:
+        value = dpll_iterative(clauses, num_vars)
 
-    if assignment is None:
+    if value is None:
         return ("UNSAT", None)
 
-    # Build DIMACS-style model from assignment dict
+    # Build DIMACS-style model from the values fixed up front and the
+    # search's value array, read at the positive literal (unassigned -> false)
     model = []
     for v in range(1, num_vars + 1):
-        val = assignment.get(v, False)
-        model.append(v if val else -v)
-
-    return ("SAT", model)
-
-
-# Iterative DPLL with unit propagation and a simple branching heuristic
-def dpll_iterative(clauses, num_vars):
-    # Stack of partial assignments (DFS)
-    stack = [dict()]
-
-    while stack:
-        assignment = stack.pop()
-
-        # 1. Unit propagation on this assignment
-        assignment = assignment.copy()  # work on our own copy
-        if not unit_propagate(clauses, assignment):
-            # Contradiction -> backtrack
-            continue
-
-        # 2. Check if all clauses are satisfied
-        all_sat = True
-        for clause in clauses:
-            status = clause_status(clause, assignment)
-            if status == "UNSAT":
-                all_sat = False
-                break
-            if status != "SAT":
-                all_sat = False
-
-        if all_sat:
-            return assignment
-
-        # 3. Choose a branching literal from the shortest unsatisfied clause
-        lit = choose_branch_literal(clauses, assignment)
-        if lit is None:
-            # Nothing left to branch on: treat as model
-            return assignment
-
-        var = abs(lit)
-        prefer_true = lit > 0
-
-        # 4. Push two branches: try preferred value first (so it is popped last)
-        assign1 = assignment.copy()
-        assign1[var] = prefer_true
-
-        assign2 = assignment.copy()
-        assign2[var] = not prefer_true
-
-        # Stack is LIFO; we want assign1 explored first, so push assign2 then assign1
-        stack.append(assign2)
-        stack.append(assign1)
-
-    # Explored all branches, no model found
-    return None
-
-
-def unit_propagate(clauses, assignment):
-    changed = True
-    while changed:
-        changed = False
-        for clause in clauses:
-            status = clause_status(clause, assignment)
-            if status == "UNSAT":
-                return False
-            if isinstance(status, tuple) and status[0] == "UNIT":
-                lit = status[1]
-                var = abs(lit)
-                value = lit > 0
-
-                if var in assignment:
-                    if assignment[var] != value:
-                        return False
-                else:
-                    assignment[var] = value
-                    changed = True
-                    # Restart scanning clauses with this new info
-                    break
-    return True
-
-
-# Evaluate a single clause under the current assignment
-def clause_status(clause, assignment):
-    unassigned_lits = []
-
-    for lit in clause:
-        var = abs(lit)
-        sign = lit > 0
-
-        if var in assignment:
-            if assignment[var] == sign:
-                return "SAT"  # some literal is true
-            # else this literal is false, check others
+        if (fixed[v] or value[2 * v]) == TRUE:
+            model.append(v)
         else:
-            unassigned_lits.append(lit)
+            model.append(-v)
 
-    # No literal was true
-    if not unassigned_lits:
-        # All literals assigned and false
-        return "UNSAT"
+    return ("SAT", model)
 
-    if len(unassigned_lits) == 1:
-        return ("UNIT", unassigned_lits[0])
 
-    return "UNDEF"
+# The search works on literal codes instead of signed ints: +v is 2*v and
+# -v is 2*v + 1. The variable is code >> 1, the negation code ^ 1, and the
+# code indexes the value and watch arrays directly, without abs() or sign
+# tests
+def encode_clauses(clauses):
+    return [
+        [2 * lit if lit > 0 else 1 - 2 * lit for lit in clause] for clause in clauses
+    ]
 
 
-# simple Moms Style Heuristic
-def choose_branch_literal(clauses, assignment):
-    # 1) Find the minimum length of any not-yet-satisfied clause
-    min_len = None
+# One-off clean-up before the search: drop tautologies and repeated
+# literals, assign the unit clauses, remove the clauses they satisfy and
+# the literals they falsify, then assign pure literals. Returns (clauses
+# sorted by length, fixed values as a bytearray indexed by variable), or
+# None if a clause is empty
+def simplify(clauses, num_vars):
+    clean = []
     for clause in clauses:
-        status = clause_status(clause, assignment)
-        if status == "SAT":
-            continue
-        if status == "UNSAT":
-            # contradiction will be handled elsewhere
-            continue
-
-        # collect unassigned literals in this clause
-        unassigned = []
+        lits = set(clause)
+        if any(-lit in lits for lit in lits):
+            continue  # tautology, always satisfied
+        clean.append(sorted(lits, key=abs))
+
+    fixed = bytearray(num_vars + 1)
+    for clause in clean:
+        if len(clause) == 1:
+            lit = clause[0]
+            value = TRUE if lit > 0 else FALSE
+            if fixed[abs(lit)] == UNASSIGNED:
+                fixed[abs(lit)] = value
+            elif fixed[abs(lit)] != value:
+                return None  # contradicting unit clauses
+
+    reduced = []
+    for clause in clean:
+        kept = []
         for lit in clause:
-            var = abs(lit)
-            if var not in assignment:
-                unassigned.append(lit)
-
-        if not unassigned:
-            continue
-
-        length = len(unassigned)
-        if min_len is None or length < min_len:
-            min_len = length
-
-    if min_len is None:
-        # no clause to branch on -> treat as model or let caller handle
-        return None
+            v = fixed[abs(lit)]
+            if v == UNASSIGNED:
+                kept.append(lit)
+            elif (lit > 0) == (v == TRUE):
+                break  # satisfied by a fixed value
+        else:
+            if not kept:
+                return None  # every literal is false
+            reduced.append(kept)
+
+    # Pure literals: a variable occurring with one sign only can take that
+    # sign, which satisfies all its clauses and falsifies none. Removing
+    # those clauses can make further variables pure, so repeat to a fixpoint
+    while True:
+        polarity = bytearray(num_vars + 1)  # bit 1: positive, bit 2: negative
+        for clause in reduced:
+            for lit in clause:
+                polarity[abs(lit)] |= 1 if lit > 0 else 2
+        pure = False
+        for v in range(1, num_vars + 1):
+            if polarity[v] == 1:
+                fixed[v] = TRUE
+                pure = True
+            elif polarity[v] == 2:
+                fixed[v] = FALSE
+                pure = True
+        if not pure:
+            break
+        reduced = [
+            clause
+            for clause in reduced
+            if not any(polarity[abs(lit)] in (1, 2) for lit in clause)
+        ]
+
+    # Short clauses first: they produce units and conflicts soonest
+    reduced.sort(key=len)
+    return (reduced, fixed)
+
+
+# CPUs this process may run on: the affinity mask where the platform has
+# one (it reflects taskset and container cpusets, unlike os.cpu_count)
+def available_cpus():
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+# Run differently seeded searches in parallel, one process per seed; the
+# first to finish wins. Every search is complete, so its answer (a model or
+# None for UNSAT) holds for the formula and the other workers are killed.
+# Workers do not share learned units: that would mean polling a channel
+# from the CDCL loop, and with at most PORTFOLIO_MAX_WORKERS searches that
+# differ only by seed the extra pruning is unlikely to pay for the IPC.
+# If every worker dies without an answer, the search runs here instead
+def portfolio_search(clauses, num_vars, workers):
+    processes = []
+    readers = []
+    for seed in range(workers):
+        reader, writer = multiprocessing.Pipe(duplex=False)
+        process = multiprocessing.Process(
+            target=portfolio_worker,
+            args=(clauses, num_vars, seed, writer),
+            daemon=True,
+        )
+        process.start()
+        writer.close()  # the worker's copy is now the only write end
+        processes.append(process)
+        readers.append(reader)
+    try:
+        # A reader becomes ready when its worker sends the answer, or at
+        # end of file when the worker exits without one
+        while readers:
+            for reader in wait(readers):
+                try:
+                    return reader.recv()
+                except EOFError:
+                    readers.remove(reader)
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+    return dpll_iterative(clauses, num_vars)
+
+
+def portfolio_worker(clauses, num_vars, seed, writer):
+    writer.send(dpll_iterative(clauses, num_vars, seed))
+
+
+# Iterative DPLL with clause learning (CDCL), unit propagation and VSIDS
+# branching, over literal codes (see encode_clauses). seed 0 (or None) is
+# the plain search; other seeds perturb the initial activities so that
+# portfolio workers explore different trees. Returns the final value array
+def dpll_iterative(clauses, num_vars, seed=None):
+    # Two watched literals: clause[0] and clause[1] of every clause with at
+    # least two literals; unit clauses go straight to the root queue.
+    # watches[code] lists the clauses watching that literal
+    watches = [[] for _ in range(2 * num_vars + 2)]
+    units = []
+    for ci, clause in enumerate(clauses):
+        if not clause:
+            return None  # empty clause can never be satisfied
+        if len(clause) == 1:
+            units.append(clause[0])
+        else:
+            watches[clause[0]].append(ci)
+            watches[clause[1]].append(ci)
 
-    # 2) Among clauses of that min length, count literal occurrences
-    counts = {}  # lit -> frequency
+    # VSIDS: the variables met during conflict analysis get var_inc added to
+    # their activity, and var_inc grows by 1/VAR_DECAY per conflict, which
+    # decays all earlier bumps. Seeded with Jeroslow-Wang weights (2^-len)
+    activity = [0.0] * (num_vars + 1)
     for clause in clauses:
-        status = clause_status(clause, assignment)
-        if status == "SAT":
-            continue
-        if status == "UNSAT":
-            continue
-
-        unassigned = []
+        weight = 2.0 ** -len(clause)
         for lit in clause:
-            var = abs(lit)
-            if var not in assignment:
-                unassigned.append(lit)
-
-        if len(unassigned) != min_len:
+            activity[lit >> 1] += weight
+    if seed:
+        rng = random.Random(seed)
+        activity = [a * (0.5 + rng.random()) for a in activity]
+    var_inc = 1.0
+
+    # Only variables that occur in some clause are ever branched on. heap is
+    # a lazy max-heap of (-activity, var): a fresh entry is pushed whenever a
+    # variable is bumped or unassigned, and stale ones are skipped when popped
+    branch_vars = sorted({lit >> 1 for clause in clauses for lit in clause})
+    heap = [(-activity[var], var) for var in branch_vars]
+    heapq.heapify(heap)
+
+    # Phase saving: sign bit of the literal each variable had true when it
+    # was last unassigned (1, i.e. false, before its first assignment)
+    saved_phase = bytearray([1]) * (num_vars + 1)
+
+    # Learned clauses are appended after the num_original input clauses;
+    # clause_activity (by clause index, 0 for input clauses) picks the ones
+    # kept when the database is reduced to max_learnts
+    num_original = len(clauses)
+    clause_activity = [0.0] * num_original
+    clause_inc = 1.0
+    max_learnts = max(num_original // 3, LEARNTS_MIN)
+
+    # Restarts: conflicts since the last one, against a Luby-spaced limit
+    conflicts = 0
+    restarts = 1
+    restart_limit = RESTART_BASE * luby(restarts)
+
+    # Single mutable assignment: value[code] is TRUE/FALSE/UNASSIGNED for
+    # that literal, so value[c] and value[c ^ 1] are always set together.
+    # trail lists the true literals in order and trail_lim[d] is the trail
+    # length when decision level d + 1 began. Per variable: its decision
+    # level and reason (implying clause index, -1 for decisions and units)
+    value = bytearray(2 * num_vars + 2)
+    level = [0] * (num_vars + 1)
+    reason = [-1] * (num_vars + 1)
+    seen = bytearray(num_vars + 1)  # scratch marks for analyze()
+    trail = []
+    trail_lim = []
+    queue = []  # true literals whose watchers are still to be visited
+
+    for lit in units:
+        if value[lit] == UNASSIGNED:
+            value[lit] = TRUE
+            value[lit ^ 1] = FALSE
+            trail.append(lit)
+            queue.append(lit)
+        elif value[lit] == FALSE:
+            return None  # contradicting unit clauses
+
+    while True:
+        # 1. Unit propagation on this assignment
+        conflict = unit_propagate(
+            clauses, watches, value, queue, trail, reason, level, len(trail_lim)
+        )
+        if conflict == -1:
+            # Keep the learned clauses in check before going deeper
+            if len(clauses) - num_original > max_learnts:
+                reduce_db(
+                    clauses, watches, clause_activity, num_original, trail, reason
+                )
+                max_learnts += max_learnts // 10
+
+            # Restart: drop every decision but keep the learned clauses,
+            # activities and saved phases, so the search resumes from the
+            # most active variables instead of the old early decisions
+            if conflicts >= restart_limit and trail_lim:
+                backtrack(trail, trail_lim, 0, value, saved_phase, activity, heap)
+                conflicts = 0
+                restarts += 1
+                restart_limit = RESTART_BASE * luby(restarts)
+
+            # 2. Choose the most active unassigned variable. If there is
+            # none, every clause has all its variables assigned and none is
+            # falsified (propagation would have found it), so this is a model
+            lit = choose_branch_literal(value, activity, saved_phase, heap)
+            if lit is None:
+                return value
+
+            # 3. Decide: open a new level and try the saved phase
+            trail_lim.append(len(trail))
+            value[lit] = TRUE
+            value[lit ^ 1] = FALSE
+            level[lit >> 1] = len(trail_lim)
+            reason[lit >> 1] = -1
+            trail.append(lit)
+            queue.append(lit)
             continue
 
-        for lit in unassigned:
-            counts[lit] = counts.get(lit, 0) + 1
-
-    if not counts:
-        return None
-
-    # 3) Pick the literal with the highest count
-    best_lit = max(counts, key=counts.get)
-    return best_lit
-
-
-# pick literal from shortest clause (not necessarily Moms)
-# not as good as Moms (I think)
-# def choose_branch_literal(clauses, assignment):
-#     """
-#     Pick a literal from the shortest clause that is not yet satisfied.
-#     """
-#     best_clause = None
-#     best_len = None
-
-#     for clause in clauses:
-#         status = clause_status(clause, assignment)
-#         if status == "SAT":
-#             continue
-#         if status == "UNSAT":
-#             # Contradiction will be noticed elsewhere
-#             continue
-
-#         unassigned = []
-#         for lit in clause:
-#             var = abs(lit)
-#             if var not in assignment:
-#                 unassigned.append(lit)
-
-#         if not unassigned:
-#             continue
-
-#         if best_clause is None or len(unassigned) < best_len:
-#             best_clause = unassigned
-#             best_len = len(unassigned)
-
-#     if best_clause is None:
-#         return None
-
-#     return best_clause[0]
+        # Contradiction at level 0 -> no model exists
+        if not trail_lim:
+            return None
+
+        # 4. Learn the 1-UIP clause and bump what took part in the conflict
+        conflicts += 1
+        learnt, back_level = analyze(
+            clauses, conflict, trail, reason, level, seen,
+            clause_activity, clause_inc, activity, var_inc, heap,
+        )
+        var_inc /= VAR_DECAY
+        clause_inc /= CLAUSE_DECAY
+        if var_inc > 1e100:
+            # Rescale everything to avoid float overflow
+            activity = [a * 1e-100 for a in activity]
+            var_inc *= 1e-100
+            heap[:] = [(-activity[v], v) for v in branch_vars]
+            heapq.heapify(heap)
+        if clause_inc > 1e100:
+            clause_activity = [a * 1e-100 for a in clause_activity]
+            clause_inc *= 1e-100
+
+        # 5. Backjump to the second highest level in the learned clause
+        queue.clear()
+        backtrack(trail, trail_lim, back_level, value, saved_phase, activity, heap)
+
+        # The learned clause is asserting: learnt[0] is its only literal left
+        # unassigned, and learnt[1] (if any) is false at back_level
+        ci = len(clauses)
+        clauses.append(learnt)
+        clause_activity.append(clause_inc)
+        if len(learnt) > 1:
+            watches[learnt[0]].append(ci)
+            watches[learnt[1]].append(ci)
+        lit = learnt[0]
+        value[lit] = TRUE
+        value[lit ^ 1] = FALSE
+        level[lit >> 1] = back_level
+        reason[lit >> 1] = ci
+        trail.append(lit)
+        queue.append(lit)
+
+        # Drop stale heap entries once they pile up
+        if len(heap) > 4 * len(branch_vars):
+            heap[:] = [(-activity[v], v) for v in branch_vars if not value[2 * v]]
+            heapq.heapify(heap)
+
+
+# Undo every decision level above lvl: unassign the literals, save their
+# phases and give the variables fresh heap entries
+def backtrack(trail, trail_lim, lvl, value, saved_phase, activity, heap):
+    start = trail_lim[lvl]
+    for lit in trail[start:]:
+        var = lit >> 1
+        saved_phase[var] = lit & 1
+        value[lit] = value[lit ^ 1] = UNASSIGNED
+        heapq.heappush(heap, (-activity[var], var))
+    del trail[start:]
+    del trail_lim[lvl:]
+
+
+# Luby sequence 1, 1, 2, 1, 1, 2, 4, 1, 1, 2, ... (i starts at 1): i is
+# either the end of a block of length 2^k - 1, whose last term is 2^(k-1),
+# or lies inside it, where the block repeats the sequence from the start.
+# Deliberately a copy of solPab.luby: this module stays free of imports
+# from the alternative solver
+def luby(i):
+    while True:
+        k = 1
+        while (1 << k) - 1 < i:
+            k += 1
+        if i == (1 << k) - 1:
+            return 1 << (k - 1)
+        i -= (1 << (k - 1)) - 1
+
+
+# First-UIP conflict analysis: resolve the falsified clause with the reasons
+# of its current-level literals, latest on the trail first, until a single
+# current-level literal (the UIP) is left. Bumps every variable and learned
+# clause involved. Returns (learned clause with the negated UIP first and a
+# literal of the backjump level second, backjump level)
+def analyze(
+    clauses, conflict, trail, reason, level, seen,
+    clause_activity, clause_inc, activity, var_inc, heap,
+):
+    current_level = level[trail[-1] >> 1]
+    learnt = [0]  # slot for the asserting literal
+    pending = 0  # seen current-level literals not resolved yet
+    ci = conflict
+    var = 0  # variable resolved on (0 for the conflicting clause)
+    idx = len(trail)
+
+    while True:
+        clause_activity[ci] += clause_inc  # only read for learned clauses
+        for lit in clauses[ci]:
+            v = lit >> 1
+            if v == var or seen[v] or level[v] == 0:
+                continue
+            seen[v] = 1
+            activity[v] += var_inc
+            heapq.heappush(heap, (-activity[v], v))
+            if level[v] == current_level:
+                pending += 1
+            else:
+                learnt.append(lit)  # false literal from an earlier level
+
+        # Latest marked literal on the trail
+        idx -= 1
+        while not seen[trail[idx] >> 1]:
+            idx -= 1
+        uip = trail[idx]
+        var = uip >> 1
+        seen[var] = 0
+        pending -= 1
+        if pending == 0:
+            break
+        ci = reason[var]
+
+    # The UIP is true, so the learned clause holds its negation
+    learnt[0] = uip ^ 1
+
+    back_level = 0
+    for k in range(1, len(learnt)):
+        v = learnt[k] >> 1
+        seen[v] = 0
+        if level[v] > back_level:
+            back_level = level[v]
+            learnt[1], learnt[k] = learnt[k], learnt[1]
+
+    return (learnt, back_level)
+
+
+# Learned clause deletion: keep the most active half of the learned clauses,
+# plus every binary one and every one that is the reason of a literal on the
+# trail, then renumber the clauses and rebuild the watch lists
+def reduce_db(clauses, watches, clause_activity, num_original, trail, reason):
+    locked = {reason[lit >> 1] for lit in trail}
+    learned = [
+        ci
+        for ci in range(num_original, len(clauses))
+        if len(clauses[ci]) > 2 and ci not in locked
+    ]
+    learned.sort(key=clause_activity.__getitem__)
+    dropped = set(learned[: len(learned) // 2])
+
+    new_index = list(range(num_original))
+    kept = clauses[:num_original]
+    kept_activity = clause_activity[:num_original]
+    for ci in range(num_original, len(clauses)):
+        if ci in dropped:
+            new_index.append(-1)
+        else:
+            new_index.append(len(kept))
+            kept.append(clauses[ci])
+            kept_activity.append(clause_activity[ci])
+    clauses[:] = kept
+    clause_activity[:] = kept_activity
+
+    for lit in trail:
+        if reason[lit >> 1] >= 0:
+            reason[lit >> 1] = new_index[reason[lit >> 1]]
+
+    for watching in watches:
+        watching.clear()
+    for ci, clause in enumerate(clauses):
+        if len(clause) > 1:
+            watches[clause[0]].append(ci)
+            watches[clause[1]].append(ci)
+
+
+# Propagate the queued (already true) literals through the watched clauses;
+# implied literals are assigned at level lvl with their clause as reason,
+# recorded on the trail and queued in turn.
+# Only clauses watching a literal that just became false are visited. The
+# loop makes no Python-level calls: a literal's code is both its watch list
+# index and its value index, and kept watchers are compacted in place
+# (read i, write j). Returns the index of a falsified clause, or -1
+def unit_propagate(clauses, watches, value, queue, trail, reason, level, lvl):
+    # Everything the loop touches is a local (fast slot), constants included
+    true, false, unassigned = TRUE, FALSE, UNASSIGNED
+    pop = queue.pop
+    push = queue.append
+    record = trail.append
+
+    while queue:
+        false_lit = pop() ^ 1
+        watching = watches[false_lit]
+        n = len(watching)
+        i = j = 0
+        while i < n:
+            ci = watching[i]
+            i += 1
+            clause = clauses[ci]
+
+            # Keep the false watch in clause[1]
+            other = clause[0]
+            if other == false_lit:
+                other = clause[1]
+                clause[0] = other
+                clause[1] = false_lit
+
+            # Other watch true -> clause satisfied, keep watching
+            v = value[other]
+            if v == true:
+                watching[j] = ci
+                j += 1
+                continue
+
+            # Look for a literal that is not false to watch instead, leaving
+            # its position in k (0 if there is none). Binary clauses have no
+            # candidate and ternary ones a single one, so both skip the loop
+            size = len(clause)
+            k = 2
+            if size == 2:
+                k = 0
+            elif size == 3:
+                if value[clause[2]] == false:
+                    k = 0
+            else:
+                for k in range(2, size):
+                    if value[clause[k]] != false:
+                        break
+                else:
+                    k = 0
+            if k:
+                cand = clause[k]
+                clause[1] = cand
+                clause[k] = false_lit
+                watches[cand].append(ci)
+                continue
+
+            # No replacement: other watch must become true, or conflict
+            watching[j] = ci
+            j += 1
+            if v != unassigned:
+                del watching[j:i]  # drop the watchers moved so far
+                return ci
+            value[other] = true
+            value[other ^ 1] = false
+            reason[other >> 1] = ci
+            level[other >> 1] = lvl
+            record(other)
+            push(other)
+
+        del watching[j:]
+    return -1
+
+
+# VSIDS branching: the unassigned variable with the highest activity, in
+# the polarity it last had (saved phase), false if it was never assigned.
+# Pops the lazy heap until an entry is current: unassigned, and carrying
+# the variable's present activity. Returns a literal code or None
+def choose_branch_literal(value, activity, saved_phase, heap):
+    heappop = heapq.heappop
+    while heap:
+        neg_activity, var = heappop(heap)
+        if not value[2 * var] and -neg_activity == activity[var]:
+            return 2 * var + saved_phase[var]
+
+    # everything assigned -> treat as model or let caller handle
+    return None
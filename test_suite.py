@@ -6,8 +6,9 @@ Tests correctness, performance, and edge cases
 
 import time
 import sys
-from solver import solve_cnf
-from encoder import to_cnf
+from solver import solve_cnf, encode_clauses, portfolio_search, TRUE
+from encoder import to_cnf, read_grid
+from solPab import solve_sudoku, solve_cnf as solpab_solve_cnf
 
 class Colors:
     GREEN = '\033[92m'
@@ -322,6 +323,157 @@ def test_both_modes():
         print_fail(f"Puzzle mode failed: {e}")
         return False
 
+def check_sudoku_model(grid, model):
+    """Return None if model is a valid non-consecutive solution of grid, else why not"""
+    N = len(grid)
+    true_vars = {lit for lit in model if lit > 0}
+    digits = [[0] * N for _ in range(N)]
+    for r in range(N):
+        for c in range(N):
+            values = [v for v in range(1, N + 1) if r * N * N + c * N + v in true_vars]
+            if len(values) != 1:
+                return f"cell ({r},{c}) holds {values}"
+            digits[r][c] = values[0]
+            if grid[r][c] and grid[r][c] != values[0]:
+                return f"cell ({r},{c}) ignores clue {grid[r][c]}"
+
+    B = int(N ** 0.5)
+    units = [digits[r] for r in range(N)]
+    units += [[digits[r][c] for r in range(N)] for c in range(N)]
+    units += [[digits[br + r][bc + c] for r in range(B) for c in range(B)]
+              for br in range(0, N, B) for bc in range(0, N, B)]
+    for unit in units:
+        if sorted(unit) != list(range(1, N + 1)):
+            return f"row/column/box {unit} is not a permutation"
+
+    for r in range(N):
+        for c in range(N):
+            if c + 1 < N and abs(digits[r][c] - digits[r][c + 1]) == 1:
+                return f"cells ({r},{c}) and ({r},{c + 1}) are consecutive"
+            if r + 1 < N and abs(digits[r][c] - digits[r + 1][c]) == 1:
+                return f"cells ({r},{c}) and ({r + 1},{c}) are consecutive"
+    return None
+
+def test_solve_sudoku():
+    """Test 11: Native at-most-one solver on SAT and UNSAT grids"""
+    print_test("solve_sudoku (native at-most-one groups)")
+
+    cases = [
+        ('puzzles/puzzle1.txt', "SAT"),
+        ('puzzles/puzzle2.txt', "SAT"),
+        ('puzzles/puzzle26.txt', "UNSAT"),
+        ('test_4x4_empty.txt', "UNSAT"),
+    ]
+
+    for path, expected in cases:
+        grid = read_grid(path)
+        start = time.time()
+        status, model = solve_sudoku(grid)
+        elapsed = time.time() - start
+
+        if status != expected:
+            print_fail(f"{path}: expected {expected}, got {status}")
+            return False
+        if status == "SAT":
+            error = check_sudoku_model(grid, model)
+            if error:
+                print_fail(f"{path}: invalid solution, {error}")
+                return False
+        print_pass(f"{path}: {status} ({elapsed*1000:.2f}ms)")
+
+    return True
+
+def test_portfolio_search():
+    """Test 12: Multi-process portfolio, called repeatedly in one process"""
+    print_test("Portfolio Search (3 workers, repeated calls)")
+
+    # SAT: a 9x9 puzzle. UNSAT: 5 pigeons in 4 holes
+    sat_clauses, sat_vars = to_cnf('puzzles/puzzle1.txt')
+    sat_clauses = [list(c) for c in sat_clauses]
+    n = 4
+    unsat_clauses = [[p * n + h + 1 for h in range(n)] for p in range(n + 1)]
+    for h in range(n):
+        for p1 in range(n + 1):
+            for p2 in range(p1 + 1, n + 1):
+                unsat_clauses.append([-(p1 * n + h + 1), -(p2 * n + h + 1)])
+    unsat_vars = (n + 1) * n
+
+    start = time.time()
+    for i in range(5):
+        value = portfolio_search(encode_clauses(sat_clauses), sat_vars, 3)
+        if value is None:
+            print_fail(f"Call {i + 1}: expected SAT, got UNSAT")
+            return False
+        model = {v if value[2 * v] == TRUE else -v for v in range(1, sat_vars + 1)}
+        for clause in sat_clauses:
+            if not any(lit in model for lit in clause):
+                print_fail(f"Call {i + 1}: model doesn't satisfy clause {clause}")
+                return False
+
+        if portfolio_search(encode_clauses(unsat_clauses), unsat_vars, 3) is not None:
+            print_fail(f"Call {i + 1}: expected UNSAT, got SAT")
+            return False
+    elapsed = time.time() - start
+
+    print_pass(f"5 SAT + 5 UNSAT portfolio calls verified ({elapsed:.2f}s)")
+    return True
+
+def test_solpab_cnf():
+    """Test 13: solPab's CDCL solver on plain CNF input"""
+    print_test("solPab.solve_cnf on CNF formulas")
+
+    import random
+
+    def pigeonhole(n):
+        clauses = [[p * n + h + 1 for h in range(n)] for p in range(n + 1)]
+        for h in range(n):
+            for p1 in range(n + 1):
+                for p2 in range(p1 + 1, n + 1):
+                    clauses.append([-(p1 * n + h + 1), -(p2 * n + h + 1)])
+        return clauses, (n + 1) * n
+
+    cases = [
+        ("basic SAT", [[1, 2], [-1, 3]], 3, "SAT"),
+        ("basic UNSAT", [[1], [-1]], 1, "UNSAT"),
+        ("empty formula", [], 5, "SAT"),
+        ("empty clause", [[1, 2], [], [3]], 3, "UNSAT"),
+        ("unit chain", [[1], [-1, 2], [-2, 3]], 3, "SAT"),
+        ("pigeonhole 4/3", *pigeonhole(3), "UNSAT"),
+        ("pigeonhole 6/5", *pigeonhole(5), "UNSAT"),
+    ]
+
+    # Test 6's random formula, then random 3-SAT around the threshold;
+    # expected results come from solver.solve_cnf
+    random.seed(42)
+    clauses = [[random.choice([1, -1]) * random.randint(1, 50)
+                for _ in range(random.randint(2, 5))] for _ in range(200)]
+    cases.append(("random 50 vars/200 clauses", clauses, 50, solve_cnf(clauses, 50)[0]))
+    random.seed(7)
+    for i in range(20):
+        clauses = [[random.choice([1, -1]) * v for v in random.sample(range(1, 41), 3)]
+                   for _ in range(170)]
+        cases.append((f"random 3-SAT #{i + 1}", clauses, 40, solve_cnf(clauses, 40)[0]))
+
+    start = time.time()
+    for name, clauses, num_vars, expected in cases:
+        status, model = solpab_solve_cnf(clauses, num_vars)
+        if status != expected:
+            print_fail(f"{name}: expected {expected}, got {status}")
+            return False
+        if status == "SAT":
+            if len(model) != num_vars:
+                print_fail(f"{name}: model has {len(model)} literals, expected {num_vars}")
+                return False
+            for clause in clauses:
+                if not any(lit in model for lit in clause):
+                    print_fail(f"{name}: model doesn't satisfy clause {clause}")
+                    return False
+    elapsed = time.time() - start
+
+    sat = sum(1 for case in cases if case[3] == "SAT")
+    print_pass(f"{len(cases)} formulas ({sat} SAT, models verified) ({elapsed*1000:.2f}ms)")
+    return True
+
 def run_all_tests():
     """Run all tests and generate report"""
     print(f"\n{Colors.BOLD}{'='*60}")
@@ -338,7 +490,10 @@ def run_all_tests():
         test_pigeonhole,
         test_sudoku_encoder,
         test_performance_scaling,
-        test_both_modes
+        test_both_modes,
+        test_solve_sudoku,
+        test_portfolio_search,
+        test_solpab_cnf
     ]
 
     results = []